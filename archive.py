@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 import sys
 import os
+import mmap
 import time
+import pickle
+import struct
+import atexit
 
 
 # ── CONSTANTS FOR PAGE/RECORD LAYOUT ─────────────────────────────────────
@@ -10,12 +14,20 @@ NUM_SLOTS = 10
 # Page header = 1 byte (occupied_count) + NUM_SLOTS bytes (slot bitmap: 0=free,1=occupied)
 PAGE_HEADER_SIZE = 1 + NUM_SLOTS
 
-# Pack/unpack helper: convert an integer to 4 bytes (big‐endian), and back
-def int_to_bytes(x: int) -> bytes:
-    return x.to_bytes(4, byteorder="big", signed=True)
+# Since each slot's bitmap entry is a whole byte holding 0 or 1, loading
+# the bitmap little-endian puts slot i's flag at bit 8*i. _SLOT_BITS has
+# bit 8*i set for every slot, which lets us find free/occupied slots with
+# bit arithmetic instead of a Python loop over the bytes.
+_SLOT_BITS = int.from_bytes(b'\x01' * NUM_SLOTS, "little")
+
+# Pack/unpack helper: convert an integer to 4 bytes (big‐endian), and
+# back, through one precompiled Struct — bound methods, so no Python-level
+# wrapper call per conversion. Out-of-range ints raise struct.error.
+_S32 = struct.Struct(">i")
+int_to_bytes = _S32.pack
 
 def bytes_to_int(b: bytes) -> int:
-    return int.from_bytes(b, byteorder="big", signed=True)
+    return _S32.unpack(b)[0]
 
 MAX_PAGES = 1000
 
@@ -25,6 +37,139 @@ OUTPUT_FILE = "output.txt"
 LOG_FILE = "log.csv"
 
 
+# In-memory catalog cache: re-parsing catalog.meta on every operation is
+# redundant file I/O, so we keep the parsed dict around and only re-read
+# when the file's mtime changes on disk.
+_catalog_cache = None
+_catalog_mtime = None
+
+# catalog.meta is a packed binary file: the magic below, then one entry
+# per type — [u8 name_len][name][u8 num_fields][u8 pk_index] followed per
+# field by [u8 name_len][name][u8 ftype_code][u8 flen], ftype_code 0=int,
+# 1=str. All scalars are single bytes, so entries are walked with plain
+# byte indexing; appends stay O(1) since there is no leading type count.
+# Files still in the old "|"-separated text format are migrated on read.
+_CATALOG_MAGIC = b"DAC1"
+_FTYPE_CODES = {"int": 0, "str": 1}
+_FTYPE_NAMES = ("int", "str")
+
+
+def _pack_catalog_entry(tname, num_fields, pk_index, fields_list) -> bytes:
+    entry = bytearray()
+    name_b = tname.encode("utf-8")
+    entry.append(len(name_b))
+    entry += name_b
+    entry.append(num_fields)
+    entry.append(pk_index)
+    for fname, ftype, flen in fields_list:
+        fname_b = fname.encode("utf-8")
+        entry.append(len(fname_b))
+        entry += fname_b
+        entry.append(_FTYPE_CODES[ftype])
+        entry.append(flen)
+    return bytes(entry)
+
+
+def _parse_binary_catalog(buf) -> dict:
+    """Walk the packed entries after the magic; a truncated or corrupt
+    tail just ends the walk (mirroring how bad text lines were skipped)."""
+    catalog = {}
+    pos = len(_CATALOG_MAGIC)
+    size = len(buf)
+    try:
+        while pos < size:
+            name_len = buf[pos]
+            pos += 1
+            tname = buf[pos: pos + name_len].decode("utf-8")
+            pos += name_len
+            nf = buf[pos]
+            pk = buf[pos + 1]
+            pos += 2
+            fields = []
+            for _ in range(nf):
+                fname_len = buf[pos]
+                pos += 1
+                fname = buf[pos: pos + fname_len].decode("utf-8")
+                pos += fname_len
+                ftype = _FTYPE_NAMES[buf[pos]]
+                flen = buf[pos + 1]
+                pos += 2
+                fields.append((fname, ftype, flen))
+            catalog[tname] = {
+                "num_fields": nf,
+                "pk_index": pk,
+                "fields": fields
+            }
+    except (IndexError, UnicodeDecodeError):
+        pass
+    return catalog
+
+
+def _parse_text_catalog(f) -> dict:
+    """Parse the legacy text format (one "|"-separated line per type).
+    Malformed lines are skipped. Only used to migrate old files."""
+    catalog = {}
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+
+        parts = line.split("|")
+        # we need at least: tname, nf, pk
+        if len(parts) < 3:
+            # malformed: not enough parts
+            continue
+
+        try:
+            tname, nf_str, pk_str, *flds = parts
+            nf = int(nf_str)
+            pk = int(pk_str)
+            fields = []
+            for fld in flds:
+                fname, ftype, flen_str = fld.split(",")
+                flen = int(flen_str)
+                fields.append((fname, ftype, flen))
+
+            # sanity-check: number of parsed fields matches nf
+            if len(fields) != nf:
+                continue
+
+            catalog[tname] = {
+                "num_fields": nf,
+                "pk_index": pk,
+                "fields": fields
+            }
+
+        except (ValueError, IndexError):
+            # any parse error (bad int, wrong commas, etc.) → skip line
+            continue
+
+    return catalog
+
+
+def _migrate_text_catalog():
+    """Rewrite a legacy text catalog.meta in the binary format, atomically
+    via a temp file + os.replace. Returns the parsed catalog."""
+    global _catalog_fh
+
+    with open(CATALOG_FILE, "r") as f:
+        catalog = _parse_text_catalog(f)
+
+    tmp_path = CATALOG_FILE + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_CATALOG_MAGIC)
+        for tname, meta in catalog.items():
+            f.write(_pack_catalog_entry(
+                tname, meta["num_fields"], meta["pk_index"], meta["fields"]))
+    os.replace(tmp_path, CATALOG_FILE)
+
+    # Any open append handle now points at the replaced inode
+    if _catalog_fh is not None:
+        _catalog_fh.close()
+        _catalog_fh = None
+
+    return catalog
+
 
 def read_catalog():
     """
@@ -37,60 +182,76 @@ def read_catalog():
       },
       ...
     }
-    Malformed lines in catalog.meta are skipped.
+    The parsed dict is cached in memory and only re-parsed when
+    catalog.meta's mtime changes. Legacy text-format files are migrated
+    to the binary format on first read.
     """
-    catalog = {}
-    with open(CATALOG_FILE, "r") as f:
-        for lineno, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
+    global _catalog_cache, _catalog_mtime
 
-            parts = line.split("|")
-            # we need at least: tname, nf, pk
-            if len(parts) < 3:
-                # malformed: not enough parts
-                continue
+    try:
+        mtime = os.stat(CATALOG_FILE).st_mtime_ns
+    except OSError:
+        # no catalog file yet → empty catalog
+        return {}
+
+    if _catalog_cache is not None and mtime == _catalog_mtime:
+        return _catalog_cache
+
+    with open(CATALOG_FILE, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            catalog = {}
+        elif size >= len(_CATALOG_MAGIC):
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:len(_CATALOG_MAGIC)] == _CATALOG_MAGIC:
+                    catalog = _parse_binary_catalog(mm)
+                else:
+                    catalog = None  # legacy text file
+        else:
+            catalog = None
 
-            try:
-                tname, nf_str, pk_str, *flds = parts
-                nf = int(nf_str)
-                pk = int(pk_str)
-                fields = []
-                for fld in flds:
-                    fname, ftype, flen_str = fld.split(",")
-                    flen = int(flen_str)
-                    fields.append((fname, ftype, flen))
-
-                # sanity-check: number of parsed fields matches nf
-                if len(fields) != nf:
-                    continue
+    if catalog is None:
+        catalog = _migrate_text_catalog()
+        mtime = os.stat(CATALOG_FILE).st_mtime_ns
 
-                catalog[tname] = {
-                    "num_fields": nf,
-                    "pk_index": pk,
-                    "fields": fields
-                }
+    _catalog_cache = catalog
+    _catalog_mtime = mtime
+    return catalog
 
-            except (ValueError, IndexError):
-                # any parse error (bad int, wrong commas, etc.) → skip line
-                continue
 
-    return catalog
+# Long-lived append handle for catalog.meta, so creating many types does
+# not pay an open/close pair per entry. Appends are flushed immediately:
+# the catalog must be durable (and its mtime current for the cache check)
+# as soon as the type exists.
+_catalog_fh = None
 
 
 def write_catalog_entry(tname, num_fields, pk_index, fields_list):
     """
     fields_list = [("name","str",20), ("age","int",4), ...]
-    Append one line to catalog.meta
+    Append one packed entry to catalog.meta and update the in-memory
+    cache, so the next read_catalog() does not have to re-parse the file.
     """
-    entry = "|".join([
-        tname,
-        str(num_fields),
-        str(pk_index),
-    ] + [f"{fname},{ftype},{flen}" for fname, ftype, flen in fields_list])
-    with open(CATALOG_FILE, "a") as f:
-        f.write(entry + "\n")
+    global _catalog_cache, _catalog_mtime, _catalog_fh
+
+    if _catalog_fh is None:
+        _catalog_fh = open(CATALOG_FILE, "ab", buffering=1 << 16)
+        atexit.register(_catalog_fh.close)
+    if _catalog_fh.tell() == 0 and os.path.getsize(CATALOG_FILE) == 0:
+        _catalog_fh.write(_CATALOG_MAGIC)
+    _catalog_fh.write(_pack_catalog_entry(tname, num_fields, pk_index,
+                                          fields_list))
+    _catalog_fh.flush()
+
+    # Keep the cache in sync instead of invalidating it: the new entry is
+    # exactly what read_catalog() would parse back out of the file.
+    if _catalog_cache is not None:
+        _catalog_cache[tname] = {
+            "num_fields": num_fields,
+            "pk_index": pk_index,
+            "fields": list(fields_list)
+        }
+        _catalog_mtime = os.stat(CATALOG_FILE).st_mtime_ns
 
 
 
@@ -107,6 +268,31 @@ def compute_record_size(fields: list) -> int:
         total += flen
     return total
 
+# Precompiled record layouts: one struct.Struct per schema, so the
+# per-field type branching and byte assembly happen once instead of on
+# every pack/unpack call. Keyed by the fields tuple itself, so no
+# invalidation is needed when new types are created.
+_layouts = {}
+
+
+def get_layout(fields: list):
+    """
+    Return (struct.Struct, field_types) for a schema. The format is
+    '>b' (valid-flag) followed by 'i' per int field and '<flen>s' per
+    str field — identical byte layout to the hand-rolled packing.
+    """
+    key = tuple(fields)
+    layout = _layouts.get(key)
+    if layout is None:
+        fmt = ">b" + "".join(
+            "i" if ftype == "int" else f"{flen}s"
+            for _, ftype, flen in fields
+        )
+        layout = (struct.Struct(fmt), [ftype for _, ftype, _ in fields])
+        _layouts[key] = layout
+    return layout
+
+
 def pack_record(fields: list, values: list) -> bytes:
     """
     fields: [("name","str",20), ("age","int",4), ...]
@@ -115,28 +301,56 @@ def pack_record(fields: list, values: list) -> bytes:
     First byte = 1 (occupied). Then each field in order:
       - if int: 4‐byte big‐endian signed
       - if str: UTF‐8, then pad with b'\x00' up to flen
+        (struct's 's' conversion truncates/pads for us)
     """
-    record_bytes = bytearray()
-    record_bytes.append(1)  # valid = 1
+    layout, ftypes = get_layout(fields)
 
+    coerced = []
     for (fname, ftype, flen), val in zip(fields, values):
         if ftype == "int":
-            # Convert string→int→4 bytes
             try:
-                ival = int(val)
+                coerced.append(int(val))
             except ValueError:
                 raise ValueError(f"Field '{fname}' expects int, got '{val}'")
-            record_bytes.extend(int_to_bytes(ival))
         else:  # ftype == "str"
-            s = val.encode("utf-8")
-            if len(s) > flen:
-                # truncate if longer than flen
-                s = s[:flen]
-            record_bytes.extend(s)
-            # pad with nulls
-            record_bytes.extend(b'\x00' * (flen - len(s)))
+            coerced.append(val.encode("utf-8"))
+
+    return layout.pack(1, *coerced)  # valid = 1
+
+
+# Generated unpackers, one per schema: since the schema is fixed, we can
+# partially evaluate the unpack loop away — the generated function has
+# every field offset inlined as a constant, no per-field type branch, and
+# builds the result list in a single expression.
+_unpackers = {}
+
+
+def _make_unpacker(fields: list):
+    parts = []
+    offset = 1  # skip valid‐flag
+    for _, ftype, flen in fields:
+        if ftype == "int":
+            parts.append(f"str(_unpack_i(b, {offset})[0])")
+        else:
+            # decode up to first null (b'\x00')
+            parts.append(
+                f"b[{offset}:{offset + flen}]"
+                ".rstrip(b'\\x00').decode('utf-8', errors='ignore')"
+            )
+        offset += flen
+    ns = {"_unpack_i": _S32.unpack_from}
+    exec("def u(b):\n    return [" + ", ".join(parts) + "]", ns)
+    return ns["u"]
+
+
+def get_unpacker(fields: list):
+    key = tuple(fields)
+    unpacker = _unpackers.get(key)
+    if unpacker is None:
+        unpacker = _make_unpacker(fields)
+        _unpackers[key] = unpacker
+    return unpacker
 
-    return bytes(record_bytes)
 
 def unpack_record(fields: list, record_bytes: bytes) -> list:
     """
@@ -144,117 +358,316 @@ def unpack_record(fields: list, record_bytes: bytes) -> list:
     return a list of string representations: [ "Alice", "30", "Istanbul" ].
     (We ignore the valid‐flag byte, assuming it’s already checked.)
     """
-    values = []
-    offset = 1  # skip valid‐flag
-    for (fname, ftype, flen) in fields:
-        chunk = record_bytes[offset: offset + flen]
-        if ftype == "int":
-            ival = bytes_to_int(chunk)
-            values.append(str(ival))
-        else:
-            # decode up to first null (b'\x00')
-            s = chunk.rstrip(b'\x00').decode("utf-8", errors="ignore")
-            values.append(s)
-        offset += flen
-    return values
+    return get_unpacker(fields)(record_bytes)
 
 
 
-def find_record_page_slot(tname: str, pk_value: str):
+# ── PERSISTENT .DAT HANDLES ──────────────────────────────────────────────
+# One open file handle (plus a shared writable mmap) per type for the life
+# of the process, instead of an open/close pair in every handler call.
+
+_dat_files = {}  # tname → (file_object, mmap_or_None)
+
+
+def get_dat(tname: str):
+    """
+    Return (f, mm) for <tname>.dat, lazily opening it read-write (creating
+    it if missing) and mmapping its contents. mm is None while the file is
+    still empty, since a zero-length file cannot be mapped.
+    """
+    entry = _dat_files.get(tname)
+    if entry is not None:
+        return entry
+
+    dat_filename = f"{tname}.dat"
+    fmode = "r+b" if os.path.isfile(dat_filename) else "w+b"
+    f = open(dat_filename, fmode)
+    # After the one-off index-build sweep, all fd access is single-page
+    # point reads/writes driven by PK lookups, so tell the kernel not to
+    # waste readahead on them (not available on all platforms).
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_RANDOM)
+        except OSError:
+            pass
+    size = os.fstat(f.fileno()).st_size
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) if size else None
+    _dat_files[tname] = (f, mm)
+    return f, mm
+
+
+def remap_dat(tname: str):
+    """
+    Refresh tname's mmap after the file has grown (mmaps do not track file
+    size). Tries mm.resize() first and falls back to close-and-remap.
+    Returns the updated (f, mm).
+    """
+    f, mm = _dat_files[tname]
+    f.flush()
+    size = os.fstat(f.fileno()).st_size
+    if mm is not None:
+        try:
+            mm.resize(size)
+            return f, mm
+        except (ValueError, OSError, SystemError):
+            mm.close()
+            mm = None
+    if size:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE)
+    _dat_files[tname] = (f, mm)
+    return f, mm
+
+
+def close_dat_files():
+    """Close every cached .dat mmap and handle, flushing pending writes."""
+    for f, mm in _dat_files.values():
+        try:
+            if mm is not None:
+                mm.close()
+            f.close()
+        except OSError:
+            continue
+    _dat_files.clear()
+
+
+# ── PRIMARY-KEY HASH INDEX ───────────────────────────────────────────────
+# Per-type dict mapping raw PK bytes → (page_offset, slot_index), so PK
+# probes are O(1) instead of a full page scan. Indexes are pickled to
+# <tname>.idx at exit and reloaded on the next run if still up to date.
+
+_pk_indexes = {}   # tname → {pk_bytes: (page_offset, slot_idx)}
+_pk_dirty = set()  # tnames whose index must be re-pickled at exit
+
+
+def pk_to_bytes(fields: list, pk_idx: int, pk_value: str):
+    """
+    Return the exact on-disk byte image of pk_value in the PK column
+    (int → 4-byte big-endian; str → utf-8 truncated/padded to flen).
+    Returns None if pk_value can never match (e.g. non-numeric for int).
+    """
+    _, pk_type, pk_len = fields[pk_idx]
+    if pk_type == "int":
+        try:
+            return int_to_bytes(int(pk_value))
+        except (ValueError, OverflowError, struct.error):
+            return None
+    s = pk_value.encode("utf-8")[:pk_len]
+    return s + b'\x00' * (pk_len - len(s))
+
+
+def load_pk_index(tname: str, catalog=None):
+    """
+    Return the PK index dict for tname, loading the pickled <tname>.idx if
+    it is at least as new as the .dat, otherwise rebuilding it with one
+    sequential mmap sweep of the data file.
+    """
+    if tname in _pk_indexes:
+        return _pk_indexes[tname]
+
+    dat_filename = f"{tname}.dat"
+    idx_filename = f"{tname}.idx"
+
+    # Reuse the persisted index if it isn't stale (e.g. after a crash the
+    # .dat is newer and we fall through to a rebuild).
+    try:
+        if os.stat(idx_filename).st_mtime_ns >= os.stat(dat_filename).st_mtime_ns:
+            with open(idx_filename, "rb") as f:
+                index = pickle.load(f)
+            if isinstance(index, dict):
+                _pk_indexes[tname] = index
+                return index
+    except (OSError, pickle.PickleError, EOFError):
+        pass
+
+    if catalog is None:
+        catalog = read_catalog()
+
+    index = {}
+    if tname in catalog and os.path.isfile(dat_filename):
+        fields = catalog[tname]["fields"]
+        pk_idx = catalog[tname]["pk_index"] - 1  # zero-based
+        rec_size = compute_record_size(fields)
+        page_size = PAGE_HEADER_SIZE + NUM_SLOTS * rec_size
+        pk_offset = 1 + sum(flen for _, _, flen in fields[:pk_idx])
+        pk_len = fields[pk_idx][2]
+
+        # Slice pages straight out of the shared mmap: no seek/read
+        # syscall pair per slot, no extra copy through a kernel buffer.
+        _, mm = get_dat(tname)
+        if mm is not None:
+            # Front-to-back sweep → let the kernel read ahead.
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+
+            for page_offset in range(0, len(mm), page_size):
+                header = mm[page_offset: page_offset + PAGE_HEADER_SIZE]
+                if len(header) < PAGE_HEADER_SIZE:
+                    break  # truncated trailing page
+
+                # If no records in this page, skip directly
+                if header[0] == 0:
+                    continue
+
+                # Enumerate occupied slots in O(popcount) by clearing
+                # the lowest set bit each iteration.
+                bm = int.from_bytes(header[1:1+NUM_SLOTS], "little")
+                while bm:
+                    low = bm & -bm
+                    slot_idx = (low.bit_length() - 1) >> 3
+                    record_offset = (page_offset + PAGE_HEADER_SIZE
+                                     + slot_idx * rec_size)
+                    pk_bytes = mm[record_offset + pk_offset:
+                                  record_offset + pk_offset + pk_len]
+                    index[pk_bytes] = (page_offset, slot_idx)
+                    bm ^= low
+
+            # Sweep done; from here on the mapping only serves point
+            # accesses, so drop the readahead hint again.
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_RANDOM)
+
+    _pk_indexes[tname] = index
+    _pk_dirty.add(tname)
+    return index
+
+
+def flush_pk_indexes():
+    """Pickle every modified PK index back to its <tname>.idx file."""
+    for tname in _pk_dirty:
+        try:
+            with open(f"{tname}.idx", "wb") as f:
+                pickle.dump(_pk_indexes[tname], f)
+        except OSError:
+            continue
+    _pk_dirty.clear()
+
+
+atexit.register(flush_pk_indexes)
+# Registered after flush_pk_indexes so it runs *before* it (atexit is
+# LIFO): the .dat data must be on disk before the .idx is pickled, or the
+# mtime staleness check would reject the index on the next run.
+atexit.register(close_dat_files)
+
+
+def find_record_page_slot(tname: str, pk_value: str, catalog=None):
     """
-    Scan <tname>.dat page by page searching for a record whose primary‐key field equals pk_value.
-    Returns (page_offset, slot_index) if found, else (None, None).
+    Locate the record whose primary‐key field equals pk_value via the PK
+    hash index. Returns (page_offset, slot_index) if found, else (None, None).
     - page_offset = byte offset in file where the page starts.
     - slot_index ∈ [0 .. NUM_SLOTS-1].
+    Callers that already hold the parsed catalog can pass it in to avoid
+    reloading it.
     """
-    catalog = read_catalog()
+    if catalog is None:
+        catalog = read_catalog()
     if tname not in catalog:
         return None, None
 
     fields = catalog[tname]["fields"]
     pk_idx = catalog[tname]["pk_index"] - 1  # zero-based
-    rec_size = compute_record_size(fields)
-    page_size = PAGE_HEADER_SIZE + NUM_SLOTS * rec_size
 
-    dat_filename = f"{tname}.dat"
-    if not os.path.isfile(dat_filename):
+    key = pk_to_bytes(fields, pk_idx, pk_value)
+    if key is None:
         return None, None
 
-    with open(dat_filename, "rb") as f:
-        page_offset = 0
-        while True:
-            header = f.read(PAGE_HEADER_SIZE)
-            if not header or len(header) < PAGE_HEADER_SIZE:
-                break  # no more pages
-            occupied_count = header[0]
-            slot_bitmap = header[1:1+NUM_SLOTS]
-
-            # If no records in this page, skip directly
-            if occupied_count == 0:
-                page_offset += page_size
-                f.seek(page_offset)
-                continue
+    return load_pk_index(tname, catalog).get(key, (None, None))
+
+# Insert-position hint: per-type byte offset of the first page that may
+# still have a free slot. Inserts start their scan here instead of at
+# page 0, deletes lower it, and a filled page advances it — so repeated
+# inserts stop re-reading the headers of pages that are already full.
+# Starts at 0 each run, which is always a safe (if conservative) value.
+_first_free_page = {}
+
+
+# Page-initialization buffers, keyed by page size (pages for schemas of
+# equal record size are interchangeable). _zero_pages holds an immutable
+# all-zero page for empty-file init; _page_bufs holds a reusable bytearray
+# for appending a page that already contains its first record — only the
+# header and slot 0 are ever written into it, so the tail stays zeroed
+# between calls and never needs re-clearing.
+_zero_pages = {}
+_page_bufs = {}
+
 
-            # Otherwise, read all slots
-            for slot_idx in range(NUM_SLOTS):
-                if slot_bitmap[slot_idx] == 1:
-                    # This slot is occupied; read that record
-                    record_offset = page_offset + PAGE_HEADER_SIZE + slot_idx * rec_size
-                    f.seek(record_offset)
-                    record_bytes = f.read(rec_size)
-                    # Unpack to get fields; then compare primary key
-                    values = unpack_record(fields, record_bytes)
-                    if values[pk_idx] == pk_value:
-                        return page_offset, slot_idx
+def get_zero_page(page_size: int) -> bytes:
+    page = _zero_pages.get(page_size)
+    if page is None:
+        page = bytes(page_size)
+        _zero_pages[page_size] = page
+    return page
 
-            # Advance to next page
-            page_offset += page_size
-            f.seek(page_offset)
 
-    return None, None
+# In-memory mirror of every page header, per type: the 11 header bytes of
+# page i live at offset i*PAGE_HEADER_SIZE of one contiguous bytearray.
+# Splitting the headers out of the page stream means free-slot scans touch
+# a compact array instead of headers scattered one per page across the
+# file; handlers update the mirror alongside the on-disk bytes.
+_headers = {}
 
-def find_free_slot_in_page(f_handle, page_offset: int, fields: list):
+
+def get_headers(tname: str, mm, page_size: int) -> bytearray:
     """
-    Given an open file handle positioned anywhere, and a page_offset,
-    returns the first free slot_index ∈ [0..NUM_SLOTS-1], or None if page is full.
+    Return tname's header-mirror bytearray, gathering the headers out of
+    the mapping in one pass on first access.
     """
-    rec_size = compute_record_size(fields)
-    page_size = PAGE_HEADER_SIZE + NUM_SLOTS * rec_size
+    hdrs = _headers.get(tname)
+    if hdrs is None:
+        hdrs = bytearray()
+        if mm is not None:
+            for page_offset in range(0, len(mm), page_size):
+                hdrs += mm[page_offset: page_offset + PAGE_HEADER_SIZE]
+        _headers[tname] = hdrs
+    return hdrs
+
+
+def find_free_slot_in_page(headers: bytearray, page_no: int):
+    """
+    Given a type's header mirror and a page number, returns the first
+    free slot_index ∈ [0..NUM_SLOTS-1], or None if page is full.
+    """
+    base = page_no * PAGE_HEADER_SIZE
+    if base + PAGE_HEADER_SIZE > len(headers):
+        return None
 
-    # Read header
-    f_handle.seek(page_offset)
-    header = f_handle.read(PAGE_HEADER_SIZE)
-    if len(header) < PAGE_HEADER_SIZE:
+    if headers[base] >= NUM_SLOTS:
+        return None  # page is full (occupied_count at its max)
+
+    # Branchless first-free-slot: invert the occupied bits, isolate the
+    # lowest one, and convert its bit position back to a slot index.
+    occupied = int.from_bytes(headers[base + 1: base + 1 + NUM_SLOTS], "little")
+    free = ~occupied & _SLOT_BITS
+    if free == 0:
         return None
+    return ((free & -free).bit_length() - 1) >> 3
 
-    occupied_count = header[0]
-    if occupied_count >= NUM_SLOTS:
-        return None  # page is full
 
-    slot_bitmap = header[1:1+NUM_SLOTS]
-    for idx in range(NUM_SLOTS):
-        if slot_bitmap[idx] == 0:
-            return idx
-    return None
 
 
+# One long-lived, block-buffered handle for log.csv instead of an
+# open/write/close syscall trio per command. The buffer is flushed when
+# the handle is closed at process exit.
+_log_fh = None
 
 
 def log_operation(op_string: str, status: bool):
+    global _log_fh
+    if _log_fh is None:
+        _log_fh = open(LOG_FILE, "a", buffering=1 << 16)
+        atexit.register(_log_fh.close)
     ts = int(time.time())
     # Append a line to log.csv: timestamp, the raw operation, and “success”/“failure”
-    with open(LOG_FILE, "a") as log_f:
-        log_f.write(f"{ts}, {op_string}, {'success' if status else 'failure'}\n")
+    _log_fh.write(f"{ts}, {op_string}, {'success' if status else 'failure'}\n")
 
-def handle_create_type(tokens: list):
+def handle_create_type(tokens: list, op_string: str):
     """
     Expected tokens format:
       ["create", "type", type_name, num_fields, pk_index,
        field1_name, field1_type, field2_name, field2_type, ..., fieldN_name, fieldN_type]
 
+    op_string is the original input line, used verbatim for logging.
     Returns True if type was created successfully; False otherwise.
     """
-    op_string = " ".join(tokens)
     # Basic token‐count check: we need at least 6 tokens (create, type, name, nf, pk, first-field)
     if len(tokens) < 6:
         log_operation(op_string, False)
@@ -340,130 +753,189 @@ def handle_create_type(tokens: list):
     return True
 
 
-def handle_create_record(tokens: list):
+def _insert_record(tname: str, value_tokens: list, catalog: dict) -> bool:
     """
-    Expected tokens format:
-      ["create", "record", type_name, val1, val2, ..., valN]
-    Returns True if insertion succeeded; False otherwise.
+    Core insertion shared by handle_create_record and the batch path in
+    main(). Assumes tname exists in catalog. Returns True on success;
+    does no logging (callers log with the original command string).
     """
-    op_string = " ".join(tokens)
-
-    # 1) Minimal token‐count check
-    if len(tokens) < 4:
-        log_operation(op_string, False)
-        return False
-
-    _, _, tname, *value_tokens = tokens
-
-    # 2) Load catalog; verify type exists
-    catalog = read_catalog()
-    if tname not in catalog:
-        log_operation(op_string, False)
-        return False
-
-    # 3) Extract schema details
+    # 1) Extract schema details
     num_fields = catalog[tname]["num_fields"]
     pk_index = catalog[tname]["pk_index"] - 1  # zero-based
     fields = catalog[tname]["fields"]
     rec_size = compute_record_size(fields)
     page_size = PAGE_HEADER_SIZE + NUM_SLOTS * rec_size
-    dat_filename = f"{tname}.dat"
 
-    # 4) Check correct number of values
+    # 2) Check correct number of values
     if len(value_tokens) != num_fields:
-        log_operation(op_string, False)
         return False
 
-    # 5) Check primary‐key uniqueness
+    # 3) Check primary‐key uniqueness: compute the raw bytes key once and
+    # probe the index directly — the same key records the insert below.
     pk_value = value_tokens[pk_index]
-    page_off, slot_idx = find_record_page_slot(tname, pk_value)
-    if page_off is not None:
+    key = pk_to_bytes(fields, pk_index, pk_value)
+    if key is None:
+        # pk_value doesn't fit the PK column's type
+        return False
+    index = load_pk_index(tname, catalog)
+    if key in index:
         # Duplicate primary key
-        log_operation(op_string, False)
         return False
 
-    # 6) Pack record bytes
+    # 4) Pack record bytes
     try:
         record_bytes = pack_record(fields, value_tokens)
     except ValueError:
         # Type‐mismatch in one of the fields
-        log_operation(op_string, False)
         return False
 
-    # 7) Open the .dat file (create if missing)
+    # 5) Get the persistent .dat handle (created if missing)
     #    We’ll append pages if no existing page has a free slot.
-    fmode = "r+b" if os.path.isfile(dat_filename) else "w+b"
-    with open(dat_filename, fmode) as f:
-        # Pointer to first page
-        page_offset = 0
-        f.seek(0, os.SEEK_END)
-        file_size = f.tell()
-        f.seek(0)
-
-        # If file is empty (no pages), create page0
-        if file_size == 0:
-            # Initialize a brand‐new empty page:
-            #   occupied_count = 0, slot_bitmap = [0]*NUM_SLOTS, then zero out all slots
-            empty_header = bytearray([0] + [0]*NUM_SLOTS)
-            f.write(empty_header)
-            f.write(b'\x00' * (NUM_SLOTS * rec_size))
-            file_size = page_size
-
-        # Now scan existing pages for a free slot
-        while page_offset < file_size:
-            free_slot = find_free_slot_in_page(f, page_offset, fields)
-            if free_slot is not None:
-                # We found a free slot here → write record
-                #  a) update valid‐flag and field‐bytes
-                record_offset = page_offset + PAGE_HEADER_SIZE + free_slot * rec_size
-                f.seek(record_offset)
-                f.write(record_bytes)
-
-                #  b) update header: occupied_count + slot_bitmap
-                f.seek(page_offset)
-                header = bytearray(f.read(PAGE_HEADER_SIZE))
-                header[0] += 1              # increment occupied_count
-                header[1 + free_slot] = 1   # mark this slot occupied
-                f.seek(page_offset)
-                f.write(header)
-                log_operation(op_string, True)
-                return True
-
-            # Move to next page
-            page_offset += page_size
-
-        # If we reach here, no existing page had room → append a new page
-        f.seek(file_size)  # move to EOF
-
-
-        # —— enforce your chosen pages-per-file cap ——
-        num_pages = file_size // page_size
-        if num_pages >= MAX_PAGES:
-            log_operation(op_string, False)
-            return False
-        # ————————————————————————————————
+    f, mm = get_dat(tname)
+
+    f.seek(0, os.SEEK_END)
+    file_size = f.tell()
+
+    # If file is empty (no pages), create page0
+    if file_size == 0:
+        # A brand-new empty page is all zeros (occupied_count = 0,
+        # clear bitmap, zeroed slots): one write of the cached page.
+        f.write(get_zero_page(page_size))
+        file_size = page_size
+        f, mm = remap_dat(tname)
+
+    headers = get_headers(tname, mm, page_size)
+    num_pages = file_size // page_size
+    if len(headers) < num_pages * PAGE_HEADER_SIZE:
+        # Mirror was built before the empty-file init above added page0
+        headers += bytes(num_pages * PAGE_HEADER_SIZE - len(headers))
+
+    # Now scan existing pages for a free slot, starting at the hint
+    # (every page before it is known to be full).
+    page_no = min(_first_free_page.get(tname, 0), file_size) // page_size
+    while page_no < num_pages:
+        free_slot = find_free_slot_in_page(headers, page_no)
+        page_offset = page_no * page_size
+        if free_slot is not None:
+            # We found a free slot here → store the record and header
+            # update through the shared mapping: no read-back of the
+            # header and no write syscalls (writeback is asynchronous).
+            #  a) valid‐flag and field‐bytes
+            record_offset = page_offset + PAGE_HEADER_SIZE + free_slot * rec_size
+            mm[record_offset: record_offset + rec_size] = record_bytes
+
+            #  b) header: occupied_count + slot_bitmap, in the mirror
+            #     and mirrored byte-for-byte to the mapping
+            base = page_no * PAGE_HEADER_SIZE
+            occupied = headers[base] + 1
+            headers[base] = occupied
+            headers[base + 1 + free_slot] = 1
+            mm[page_offset] = occupied
+            mm[page_offset + 1 + free_slot] = 1
+
+            # Refresh the hint: this page, or the next one if we
+            # just filled its last slot.
+            if occupied >= NUM_SLOTS:
+                _first_free_page[tname] = page_offset + page_size
+            else:
+                _first_free_page[tname] = page_offset
+
+            #  c) register the new record in the PK index
+            index[key] = (page_offset, free_slot)
+            _pk_dirty.add(tname)
+
+            return True
+
+        # Move to next page (and remember this one was full)
+        page_no += 1
+        _first_free_page[tname] = page_no * page_size
+
+    # If we reach here, no existing page had room → append a new page
+
+    # —— enforce your chosen pages-per-file cap ——
+    if num_pages >= MAX_PAGES:
+        return False
+    # ————————————————————————————————
+
+    # Initialize the new page in the reusable buffer and append it
+    # with a single write: header says 1 occupied slot (slot 0), the
+    # record goes into slot 0, and the tail is already zeroed.
+    page_buf = _page_bufs.get(page_size)
+    if page_buf is None:
+        page_buf = bytearray(page_size)
+        _page_bufs[page_size] = page_buf
+    page_buf[0] = 1                     # occupied_count
+    page_buf[1 + 0] = 1                 # slot 0 bitmap bit
+    page_buf[PAGE_HEADER_SIZE:PAGE_HEADER_SIZE + rec_size] = record_bytes
+    f.seek(file_size)  # move to EOF
+    f.write(page_buf)
+    remap_dat(tname)
+
+    # Mirror the new page's header (slice copies out of the shared buffer)
+    headers += page_buf[:PAGE_HEADER_SIZE]
+
+    # The fresh page still has NUM_SLOTS-1 free slots
+    _first_free_page[tname] = file_size
+
+    # Register the new record in the PK index (new page starts at the
+    # old EOF, record goes into slot 0).
+    index[key] = (file_size, 0)
+    _pk_dirty.add(tname)
 
+    return True
 
-        # Initialize new page (same as above)
-        new_header = bytearray([0] + [0]*NUM_SLOTS)
-        new_header[0] = 1                   # will store 1 occupied slot
-        new_header[1 + 0] = 1               # we’ll insert in slot 0
-        f.write(new_header)
-        # Write the first record in slot 0
-        #   pad the rest of the page’s slots with zero‐bytes
-        page_content = bytearray(NUM_SLOTS * rec_size)
-        page_content[0:rec_size] = record_bytes
-        f.write(bytes(page_content))
 
-        log_operation(op_string, True)
-        return True
+def handle_create_record(tokens: list, op_string: str):
+    """
+    Expected tokens format:
+      ["create", "record", type_name, val1, val2, ..., valN]
+    op_string is the original input line, used verbatim for logging.
+    Returns True if insertion succeeded; False otherwise.
+    """
 
-    # Shouldn’t get here, but if we do:
-    log_operation(op_string, False)
-    return False
+    # Minimal token‐count check
+    if len(tokens) < 4:
+        log_operation(op_string, False)
+        return False
+
+    _, _, tname, *value_tokens = tokens
+
+    # Load catalog; verify type exists
+    catalog = read_catalog()
+    if tname not in catalog:
+        log_operation(op_string, False)
+        return False
 
+    status = _insert_record(tname, value_tokens, catalog)
+    log_operation(op_string, status)
+    return status
 
-def handle_delete_record(tokens: list):
+
+def handle_create_record_batch(tname: str, cmds: list):
+    """
+    Insert a consecutive run of "create record" commands that all target
+    the same type; cmds holds (op_string, tokens) pairs, where op_string
+    is the original input line. The catalog (and, through _insert_record,
+    the schema caches, PK index, and .dat handle) is loaded once for the
+    whole run instead of per command. Each command is still validated and
+    logged individually, exactly as handle_create_record would.
+    """
+    catalog = read_catalog()
+    known = tname in catalog
+
+    for op_string, tokens in cmds:
+        try:
+            if not known or len(tokens) < 4:
+                log_operation(op_string, False)
+                continue
+            status = _insert_record(tname, tokens[3:], catalog)
+            log_operation(op_string, status)
+        except Exception:
+            log_operation(op_string, False)
+            continue
+
+
+def handle_delete_record(tokens: list, op_string: str):
     """
     Expected tokens format:
       ["delete", "record", type_name, primary_key_value]
@@ -475,8 +947,9 @@ def handle_delete_record(tokens: list):
 
     If not found or on error:
       - Return False
+
+    op_string is the original input line, used verbatim for logging.
     """
-    op_string = " ".join(tokens)
 
     # 1) Token‐count check: must be exactly 4 tokens
     if len(tokens) != 4:
@@ -497,50 +970,64 @@ def handle_delete_record(tokens: list):
     pk_index = catalog[tname]["pk_index"] - 1  # zero-based
     rec_size = compute_record_size(fields)
     page_size = PAGE_HEADER_SIZE + NUM_SLOTS * rec_size
-    dat_filename = f"{tname}.dat"
 
-    # 4) Find the record’s page + slot
-    page_off, slot_idx = find_record_page_slot(tname, pk_value)
-    if page_off is None:
+    # 4) Find the record’s page + slot: one key computation serves both
+    # the lookup and the index removal below
+    key = pk_to_bytes(fields, pk_index, pk_value)
+    index = load_pk_index(tname, catalog)
+    entry = index.get(key) if key is not None else None
+    if entry is None:
         # Record not found → failure
         log_operation(op_string, False)
         return False
+    page_off, slot_idx = entry
 
-    # 5) Open .dat in read‐write mode and update:
+    # 5) Update the record through the shared mapping:
     try:
-        with open(dat_filename, "r+b") as f:
-            # (a) Invalidate the record: set its valid‐flag byte = 0
-            record_offset = page_off + PAGE_HEADER_SIZE + slot_idx * rec_size
-            f.seek(record_offset)
-            f.write(b'\x00')  # write a single zero byte for valid‐flag
-
-            # (b) Update page header: decrement occupied_count, clear slot bitmap
-            f.seek(page_off)
-            header = bytearray(f.read(PAGE_HEADER_SIZE))
-            # header[0] is occupied_count; header[1 + slot_idx] is the bitmap
-            if header[0] > 0:
-                header[0] -= 1
-            header[1 + slot_idx] = 0
-
-            f.seek(page_off)
-            f.write(header)
+        f, mm = get_dat(tname)
+        headers = get_headers(tname, mm, page_size)
+        base = (page_off // page_size) * PAGE_HEADER_SIZE
+
+        # (a) Invalidate the record: set its valid‐flag byte = 0
+        record_offset = page_off + PAGE_HEADER_SIZE + slot_idx * rec_size
+        mm[record_offset] = 0
+
+        # (b) Update page header: decrement occupied_count, clear slot
+        # bitmap. The current count comes from the header mirror, so the
+        # update is two byte stores in the mirror mirrored to the mapping
+        # — no header read-back, no bytearray per delete.
+        occupied = headers[base]
+        if occupied > 0:
+            occupied -= 1
+        headers[base] = occupied
+        headers[base + 1 + slot_idx] = 0
+        mm[page_off] = occupied
+        mm[page_off + 1 + slot_idx] = 0
     except Exception:
         log_operation(op_string, False)
         return False
 
-    # 6) Log success and return True
+    # 6) Drop the record from the PK index
+    index.pop(key, None)
+    _pk_dirty.add(tname)
+
+    # The freed slot may now be the earliest insert position
+    if page_off < _first_free_page.get(tname, 0):
+        _first_free_page[tname] = page_off
+
+    # 7) Log success and return True
     log_operation(op_string, True)
     return True
 
 
-def handle_search_record(tokens: list):
+def handle_search_record(tokens: list, op_string: str):
     """
     Expected tokens:
       ["search", "record", type_name, primary_key_value]
     If found: return list_of_field_values.
     If not found or any error: return None.
+    op_string is the original input line, used verbatim for logging.
     """
-    op_string = " ".join(tokens)
 
     # 1) Token‐count check
     if len(tokens) != 4:
@@ -560,19 +1047,17 @@ def handle_search_record(tokens: list):
     rec_size = compute_record_size(fields)
 
     # 4) Locate the record
-    page_off, slot_idx = find_record_page_slot(tname, pk_value)
+    page_off, slot_idx = find_record_page_slot(tname, pk_value, catalog)
     if page_off is None:
         log_operation(op_string, False)
         return None
 
-    # 5) Read and unpack
-    dat_filename = f"{tname}.dat"
+    # 5) Read and unpack through the shared mapping
     try:
-        with open(dat_filename, "rb") as f:
-            record_offset = page_off + PAGE_HEADER_SIZE + slot_idx * rec_size
-            f.seek(record_offset)
-            record_bytes = f.read(rec_size)
-            values = unpack_record(fields, record_bytes)
+        f, mm = get_dat(tname)
+        record_offset = page_off + PAGE_HEADER_SIZE + slot_idx * rec_size
+        record_bytes = mm[record_offset: record_offset + rec_size]
+        values = unpack_record(fields, record_bytes)
     except Exception:
         log_operation(op_string, False)
         return None
@@ -600,28 +1085,53 @@ def main():
     # At program start, clear any existing output and log
     open(OUTPUT_FILE, "w").close()
 
-    with open(input_path, "r") as fin, open(OUTPUT_FILE, "a") as fout:
+    with open(input_path, "r") as fin, \
+            open(OUTPUT_FILE, "a", buffering=1 << 16) as fout:
+        # Tokenize the whole input in one pass up front. commands holds
+        # (line, tokens, op_key, tname) per non-empty line, where op_key
+        # is e.g. ("create", "record") or None for unrecognizable lines.
+        commands = []
         for line in fin:
             line = line.strip()
             if not line:
                 continue
+            tokens = line.split()
+            if len(tokens) >= 2:
+                op_key = (tokens[0].lower(), tokens[1].lower())
+                tname = tokens[2] if len(tokens) >= 3 else None
+            else:
+                op_key = None
+                tname = None
+            commands.append((line, tokens, op_key, tname))
+
+        n = len(commands)
+        i = 0
+        while i < n:
+            line, tokens, op_key, tname = commands[i]
+
+            # Bulk path: a consecutive run of inserts into the same type
+            # is handled as one batch, loading the catalog/schema state
+            # once for the whole run.
+            if op_key == ("create", "record") and tname is not None:
+                j = i + 1
+                while j < n and commands[j][2] == op_key \
+                        and commands[j][3] == tname:
+                    j += 1
+                handle_create_record_batch(
+                    tname, [(cmd[0], cmd[1]) for cmd in commands[i:j]])
+                i = j
+                continue
 
-            # Wrap *every* command in try/except:
+            # Wrap every remaining command in try/except:
             try:
-                tokens = line.split()
-                op = tokens[0].lower()
-
-                if op == "create" and tokens[1].lower() == "type":
-                    _ = handle_create_type(tokens)
-
-                elif op == "create" and tokens[1].lower() == "record":
-                    _ = handle_create_record(tokens)
+                if op_key == ("create", "type"):
+                    _ = handle_create_type(tokens, line)
 
-                elif op == "delete" and tokens[1].lower() == "record":
-                    _ = handle_delete_record(tokens)
+                elif op_key == ("delete", "record"):
+                    _ = handle_delete_record(tokens, line)
 
-                elif op == "search" and tokens[1].lower() == "record":
-                    values = handle_search_record(tokens)
+                elif op_key == ("search", "record"):
+                    values = handle_search_record(tokens, line)
                     if values is not None:
                         fout.write(" ".join(values) + "\n")
 
@@ -632,7 +1142,8 @@ def main():
             except Exception:
                 # catch everything, log as failure, and move on
                 log_operation(line, False)
-                continue
+
+            i += 1
 
 if __name__ == "__main__":
     main()